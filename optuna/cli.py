@@ -6,13 +6,12 @@ from cliff.app import App
 from cliff.command import Command
 from cliff.commandmanager import CommandManager
 from cliff.lister import Lister
-import imp
 import logging
+import operator
 import sys
 
 import optuna
 from optuna.exceptions import CLIUsageError
-from optuna.storages import RDBStorage
 from optuna import type_checking
 
 if type_checking.TYPE_CHECKING:
@@ -21,6 +20,9 @@ if type_checking.TYPE_CHECKING:
     from typing import List  # NOQA
     from typing import Optional  # NOQA
     from typing import Tuple  # NOQA
+    from types import ModuleType  # NOQA
+
+logger = optuna.logging.get_logger(__name__)
 
 
 def _check_storage_url(storage_url):
@@ -32,12 +34,32 @@ def _check_storage_url(storage_url):
     return storage_url
 
 
+def _load_module_from_file(module_name, file_path):
+    # type: (str, str) -> ModuleType
+
+    # The loaders are imported here rather than at the top of the module so that they are only
+    # loaded by the command that executes user code.
+    if sys.version_info[0] == 2:
+        import imp
+        return imp.load_source(module_name, file_path)
+
+    import importlib.machinery
+    import importlib.util
+    # The loader is given explicitly so that files without a `.py` suffix are also supported.
+    loader = importlib.machinery.SourceFileLoader(module_name, file_path)
+    spec = importlib.util.spec_from_file_location(module_name, file_path, loader=loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)  # type: ignore
+    return module
+
+
 class _BaseCommand(Command):
     def __init__(self, *args, **kwargs):
         # type: (List[Any], Dict[str, Any]) -> None
 
         super(_BaseCommand, self).__init__(*args, **kwargs)
-        self.logger = optuna.logging.get_logger(__name__)
+        self.logger = logger
 
 
 class _CreateStudy(_BaseCommand):
@@ -93,8 +115,7 @@ class _DeleteStudy(_BaseCommand):
 
         storage_url = _check_storage_url(self.app_args.storage)
         storage = optuna.storages.RDBStorage(storage_url)
-        study_id = storage.get_study_id_from_name(parsed_args.study_name)
-        storage.delete_study(study_id)
+        storage.delete_study_by_name(parsed_args.study_name)
 
 
 class _StudySetUserAttribute(_BaseCommand):
@@ -120,7 +141,15 @@ class _StudySetUserAttribute(_BaseCommand):
 class _Studies(Lister):
 
     _datetime_format = '%Y-%m-%d %H:%M:%S'
+    if sys.version_info >= (3, 6):
+        # For naive datetimes, this gives the same string as `_datetime_format` while skipping the
+        # locale-aware formatting of `strftime`.
+        _format_datetime = operator.methodcaller('isoformat', sep=' ', timespec='seconds')
+    else:
+        _format_datetime = operator.methodcaller('strftime', _datetime_format)
     _study_list_header = ('NAME', 'DIRECTION', 'N_TRIALS', 'DATETIME_START')
+    _get_study_list_fields = operator.attrgetter(
+        'study_name', 'direction', 'n_trials', 'datetime_start')
 
     def get_parser(self, prog_name):
         # type: (str) -> ArgumentParser
@@ -134,14 +163,12 @@ class _Studies(Lister):
         storage_url = _check_storage_url(self.app_args.storage)
         summaries = optuna.get_all_study_summaries(storage=storage_url)
 
-        rows = []
-        for s in summaries:
-            start = s.datetime_start.strftime(self._datetime_format) \
-                if s.datetime_start is not None else None
-            row = (s.study_name, s.direction.name, s.n_trials, start)
-            rows.append(row)
+        rows = tuple(
+            (name, direction.name, n_trials,
+             self._format_datetime(start) if start is not None else None)
+            for name, direction, n_trials, start in map(self._get_study_list_fields, summaries))
 
-        return self._study_list_header, tuple(rows)
+        return self._study_list_header, rows
 
 
 class _Dashboard(_BaseCommand):
@@ -218,7 +245,7 @@ class _StudyOptimize(_BaseCommand):
         # exception stack traces by default.
         self.app.options.debug = True
 
-        target_module = imp.load_source('optuna_target_module', parsed_args.file)
+        target_module = _load_module_from_file('optuna_target_module', parsed_args.file)
 
         try:
             target_method = getattr(target_module, parsed_args.method)
@@ -246,7 +273,7 @@ class _StorageUpgrade(_BaseCommand):
         # type: (Namespace) -> None
 
         storage_url = _check_storage_url(self.app_args.storage)
-        storage = RDBStorage(storage_url, skip_compatibility_check=True)
+        storage = optuna.storages.RDBStorage(storage_url, skip_compatibility_check=True)
         current_version = storage.get_current_version()
         head_version = storage.get_head_version()
         known_versions = storage.get_all_versions()
@@ -295,16 +322,12 @@ class _OptunaApp(App):
 
         super(_OptunaApp, self).configure_logging()
 
-        # Find the StreamHandler that is configured by super's configure_logging,
-        # and replace its formatter with our fancy one.
-        root_logger = logging.getLogger()
-        stream_handlers = [
-            handler for handler in root_logger.handlers
-            if isinstance(handler, logging.StreamHandler)
-        ]
-        assert len(stream_handlers) == 1
-        stream_handler = stream_handlers[0]
-        stream_handler.setFormatter(optuna.logging.create_default_formatter())
+        # Find the console handler that is configured by super's configure_logging, and replace
+        # its formatter with our fancy one. The handler is identified by its stream so that other
+        # handlers such as the one for `--log-file`, which is also a StreamHandler, are kept.
+        for handler in logging.getLogger().handlers:
+            if isinstance(handler, logging.StreamHandler) and handler.stream is self.stderr:
+                handler.setFormatter(optuna.logging.create_default_formatter())
 
     def clean_up(self, cmd, result, err):
         # type: (Command, int, Optional[Exception]) -> None
@@ -1,60 +1,83 @@
+import collections
 import math
 import numpy as np
-import six
+import threading
+import weakref
 
 from optuna.pruners import BasePruner
 from optuna import structs
 from optuna import type_checking
 
 if type_checking.TYPE_CHECKING:
-    from typing import Iterator  # NOQA
+    from typing import Any  # NOQA
+    from typing import Dict  # NOQA
     from typing import List  # NOQA
+    from typing import Tuple  # NOQA
 
     from optuna.study import Study  # NOQA
 
+    # The percentile cache maps `(study_id, step)` to a weak reference to the storage of the study,
+    # the number of completed trials and the percentile computed over them.
+    CacheKey = Tuple[int, int]
+    CacheValue = Tuple[weakref.ReferenceType, int, float]
 
-def _get_best_intermediate_result_over_steps(trial, direction):
-    # type: (structs.FrozenTrial, structs.StudyDirection) -> float
 
-    values = np.array(list(trial.intermediate_values.values()), np.float)
-    if direction == structs.StudyDirection.MAXIMIZE:
-        return np.nanmax(values)
-    return np.nanmin(values)
+# Below this number of intermediate values, a plain Python loop is faster than the overhead of
+# building a NumPy array.
+_N_VALUES_NUMPY_THRESHOLD = 32
+
+# Dedicated functions for percentiles that need no interpolation, used without and with NaNs
+# respectively.
+_SPECIAL_PERCENTILE_FUNCS = {0.0: np.min, 50.0: np.median, 100.0: np.max}
+_SPECIAL_NAN_PERCENTILE_FUNCS = {0.0: np.nanmin, 50.0: np.nanmedian, 100.0: np.nanmax}
 
+# Maximum number of `(study, step)` entries kept in the percentile cache of a pruner.
+_PERCENTILE_CACHE_SIZE = 1024
 
-def _get_percentile_intermediate_result_over_trials(all_trials, direction, step, percentile):
-    # type: (List[structs.FrozenTrial], structs.StudyDirection, int, float) -> float
 
-    completed_trials = [t for t in all_trials if t.state == structs.TrialState.COMPLETE]
+def _get_best_intermediate_result_over_steps(trial, direction):
+    # type: (structs.FrozenTrial, structs.StudyDirection) -> float
 
-    if len(completed_trials) == 0:
-        raise ValueError("No trials have been completed.")
+    intermediate_values = trial.intermediate_values
+    n_values = len(intermediate_values)
+    if n_values == 0:
+        raise ValueError('Trial {} has no intermediate values.'.format(trial.number))
+
+    if n_values < _N_VALUES_NUMPY_THRESHOLD:
+        values = [v for v in intermediate_values.values() if not math.isnan(v)]
+        if len(values) == 0:
+            return float('nan')
+        if direction == structs.StudyDirection.MAXIMIZE:
+            return float(max(values))
+        return float(min(values))
 
+    array = np.fromiter(intermediate_values.values(), dtype=np.float64, count=n_values)
     if direction == structs.StudyDirection.MAXIMIZE:
-        percentile = 100 - percentile
+        return float(np.nanmax(array))
+    return float(np.nanmin(array))
 
-    return float(
-        np.nanpercentile(
-            np.array([
-                t.intermediate_values[step]
-                for t in completed_trials if step in t.intermediate_values
-            ], np.float),
-            percentile))
 
+def _get_percentile_intermediate_result_over_trials(step_values, direction, percentile):
+    # type: (List[float], structs.StudyDirection, float) -> float
 
-def _is_first_in_interval_step(step, intermediate_steps, n_warmup_steps, interval_steps):
-    # type: (int, Iterator[int], int, int) -> bool
+    if direction == structs.StudyDirection.MAXIMIZE:
+        percentile = 100 - percentile
 
-    nearest_lower_pruning_step = (
-        (step - n_warmup_steps - 1) // interval_steps * interval_steps + n_warmup_steps + 1)
-    assert nearest_lower_pruning_step >= 0
+    values = np.asarray(step_values, dtype=np.float64)
+    if values.size == 0:
+        return float('nan')
 
-    # `intermediate_steps` may not be sorted so we must go through all elements.
-    second_last_step = six.moves.reduce(
-        lambda second_last_step, s: s if s > second_last_step and s != step
-        else second_last_step, intermediate_steps, -1)
+    if np.isnan(values).any():
+        special_func = _SPECIAL_NAN_PERCENTILE_FUNCS.get(percentile)
+        if special_func is not None:
+            return float(special_func(values))
+        return float(np.nanpercentile(values, percentile))
 
-    return second_last_step < nearest_lower_pruning_step
+    # Without NaNs, the functions that do not mask them give the same results faster.
+    special_func = _SPECIAL_PERCENTILE_FUNCS.get(percentile)
+    if special_func is not None:
+        return float(special_func(values))
+    return float(np.percentile(values, percentile))
 
 
 class PercentilePruner(BasePruner):
@@ -110,19 +133,32 @@ class PercentilePruner(BasePruner):
         self.n_warmup_steps = n_warmup_steps
         self.interval_steps = interval_steps
 
-    def prune(self, study, trial):
-        # type: (Study, structs.FrozenTrial) -> bool
-        """Please consult the documentation for :func:`BasePruner.prune`."""
+        # Study IDs are only unique within a storage, so an entry is valid only for the same
+        # storage object. Completed trials never change, so an entry is also valid only as long as
+        # the number of completed trials is unchanged.
+        self._percentile_cache = \
+            collections.OrderedDict()  # type: collections.OrderedDict[CacheKey, CacheValue]
+        # Guards the cache when trials are pruned from multiple threads, e.g. with `n_jobs > 1`.
+        self._percentile_cache_lock = threading.Lock()
 
-        all_trials = study.trials
-        n_trials = len([t for t in all_trials
-                        if t.state == structs.TrialState.COMPLETE])
+    def __getstate__(self):
+        # type: () -> Dict[Any, Any]
 
-        if n_trials == 0:
-            return False
+        state = self.__dict__.copy()
+        del state['_percentile_cache_lock']
+        # The cache holds weak references to storages, which cannot be pickled.
+        state['_percentile_cache'] = collections.OrderedDict()
+        return state
 
-        if n_trials < self.n_startup_trials:
-            return False
+    def __setstate__(self, state):
+        # type: (Dict[Any, Any]) -> None
+
+        self.__dict__.update(state)
+        self._percentile_cache_lock = threading.Lock()
+
+    def prune(self, study, trial):
+        # type: (Study, structs.FrozenTrial) -> bool
+        """Please consult the documentation for :func:`BasePruner.prune`."""
 
         step = trial.last_step
         if step is None:
@@ -132,9 +168,27 @@ class PercentilePruner(BasePruner):
         if step <= n_warmup_steps:
             return False
 
-        if not _is_first_in_interval_step(
-                step, six.iterkeys(trial.intermediate_values), n_warmup_steps,
-                self.interval_steps):
+        # Only the first step reported in each interval is checked. `intermediate_values` may not
+        # be sorted so we must go through all steps to find the one reported before `step`.
+        first_pruning_step = n_warmup_steps + 1
+        interval_steps = self.interval_steps
+        nearest_lower_pruning_step = (
+            (step - first_pruning_step) // interval_steps * interval_steps + first_pruning_step)
+        second_last_step = max([-1] + [s for s in trial.intermediate_values if s != step])
+        if second_last_step >= nearest_lower_pruning_step:
+            return False
+
+        # Counting the completed trials is much cheaper than fetching them, so `study.trials` is
+        # only fetched when the percentile is not cached for this number of completed trials.
+        storage = study._storage
+        study_id = study.study_id
+        complete = structs.TrialState.COMPLETE
+        n_trials = storage.get_n_trials(study_id, state=complete)
+
+        if n_trials == 0:
+            return False
+
+        if n_trials < self.n_startup_trials:
             return False
 
         direction = study.direction
@@ -142,8 +196,33 @@ class PercentilePruner(BasePruner):
         if math.isnan(best_intermediate_result):
             return True
 
-        p = _get_percentile_intermediate_result_over_trials(
-            all_trials, direction, step, self.percentile)
+        cache_key = (study_id, step)
+        with self._percentile_cache_lock:
+            cached = self._percentile_cache.get(cache_key)
+        if cached is not None and cached[0]() is storage and cached[1] == n_trials:
+            p = cached[2]
+        else:
+            # Count the completed trials again while collecting their values at `step` since more
+            # trials may have completed after they were counted above.
+            n_trials = 0
+            step_values = []  # type: List[float]
+            for t in study.trials:
+                if t.state is not complete:
+                    continue
+                n_trials += 1
+                if step in t.intermediate_values:
+                    step_values.append(t.intermediate_values[step])
+
+            # The trials are fetched and the percentile is computed without holding the lock so
+            # that threads checking other steps or studies are not blocked.
+            p = _get_percentile_intermediate_result_over_trials(
+                step_values, direction, self.percentile)
+            with self._percentile_cache_lock:
+                if (cache_key not in self._percentile_cache
+                        and len(self._percentile_cache) >= _PERCENTILE_CACHE_SIZE):
+                    self._percentile_cache.popitem(last=False)
+                self._percentile_cache[cache_key] = (weakref.ref(storage), n_trials, p)
+
         if math.isnan(p):
             return False
 
@@ -150,6 +150,17 @@ class RDBStorage(BaseStorage):
 
         self._commit_with_integrity_check(session)
 
+    def delete_study_by_name(self, study_name):
+        # type: (str) -> None
+        """Look up and delete a study by its name in a single transaction."""
+
+        session = self.scoped_session()
+
+        study = models.StudyModel.find_or_raise_by_name(study_name, session)
+        session.delete(study)
+
+        self._commit_with_integrity_check(session)
+
     @staticmethod
     def _create_unique_study_name(session):
         # type: (orm.Session) -> str
@@ -1,11 +1,13 @@
 from datetime import datetime
 import enum
+import operator
 import warnings
 
 from typing import Any
 from typing import Dict
 from typing import NamedTuple
 from typing import Optional
+from typing import Tuple  # NOQA
 
 from optuna import exceptions
 from optuna import logging
@@ -43,7 +45,7 @@ class TrialState(enum.Enum):
     def is_finished(self):
         # type: () -> bool
 
-        return self != TrialState.RUNNING
+        return self is not TrialState.RUNNING
 
 
 class StudyDirection(enum.Enum):
@@ -63,6 +65,37 @@ class StudyDirection(enum.Enum):
     MAXIMIZE = 2
 
 
+def _get_trial_state_error(state, has_datetime_start, has_datetime_complete, has_value):
+    # type: (TrialState, bool, bool, bool) -> Optional[str]
+
+    if not has_datetime_start:
+        return '`datetime_start` is supposed to be set.'
+
+    if state.is_finished():
+        if not has_datetime_complete:
+            return '`datetime_complete` is supposed to be set for a finished trial.'
+    else:
+        if has_datetime_complete:
+            return '`datetime_complete` is supposed to not be set for a finished trial.'
+
+    if state == TrialState.COMPLETE and not has_value:
+        return '`value` is supposed to be set for a complete trial.'
+
+    return None
+
+
+# The state checks of `FrozenTrial._validate` only depend on a few flags, so their results are
+# computed once for every combination.
+_TRIAL_STATE_ERRORS = {
+    (state, has_datetime_start, has_datetime_complete, has_value):
+    _get_trial_state_error(state, has_datetime_start, has_datetime_complete, has_value)
+    for state in TrialState
+    for has_datetime_start in (False, True)
+    for has_datetime_complete in (False, True)
+    for has_value in (False, True)
+}  # type: Dict[Tuple[TrialState, bool, bool, bool], Optional[str]]
+
+
 class FrozenTrial(object):
     """Status and results of a :class:`~optuna.trial.Trial`.
 
@@ -89,6 +122,12 @@ class FrozenTrial(object):
             Intermediate objective values set with :func:`optuna.trial.Trial.report`.
     """
 
+    # Store the fields in slots instead of a per-instance `__dict__` to reduce the memory footprint
+    # of studies with many trials.
+    __slots__ = (
+        'number', 'state', 'value', 'datetime_start', 'datetime_complete', 'params',
+        '_distributions', 'user_attrs', 'system_attrs', 'intermediate_values', '_trial_id', )
+
     def __init__(
         self,
         number,  # type: int
@@ -117,17 +156,20 @@ class FrozenTrial(object):
         self._distributions = distributions
         self._trial_id = trial_id
 
-    # Ordered list of fields required for `__repr__`, `__hash__` and dataframe creation.
-    # TODO(hvy): Remove this list in Python 3.6 as the order of `self.__dict__` is preserved.
-    _ordered_fields = [
-        'number', 'state', 'value', 'datetime_start', 'datetime_complete', 'params',
-        '_distributions', 'user_attrs', 'system_attrs', 'intermediate_values', '_trial_id', ]
+    # Ordered list of fields required for `__repr__` and dataframe creation.
+    _ordered_fields = list(__slots__)
+
+    # Fields compared by `__eq__`, with the identifiers and scalars placed before the dictionaries
+    # so that tuple comparison returns early for different trials.
+    _get_eq_fields = operator.attrgetter(
+        '_trial_id', 'number', 'state', 'value', 'datetime_start', 'datetime_complete', 'params',
+        '_distributions', 'user_attrs', 'system_attrs', 'intermediate_values')
 
     def __eq__(self, other):
         # type: (Any) -> bool
 
         if isinstance(other, type(self)):
-            return other.__dict__ == self.__dict__
+            return self._get_eq_fields(other) == self._get_eq_fields(self)
         return False
 
     def __ne__(self, other):
@@ -135,10 +177,25 @@ class FrozenTrial(object):
 
         return not self.__eq__(other)
 
+    def __getstate__(self):
+        # type: () -> Dict[str, Any]
+
+        # Python 2.7 cannot pickle a class that defines `__slots__` without `__getstate__` using
+        # the default protocol.
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    def __setstate__(self, state):
+        # type: (Dict[str, Any]) -> None
+
+        for field, value in state.items():
+            setattr(self, field, value)
+
     def __hash__(self):
         # type: () -> int
 
-        return hash(tuple(getattr(self, field) for field in self._ordered_fields))
+        # The remaining fields include unhashable dictionaries. `_trial_id` uniquely identifies a
+        # trial and both fields are compared by `__eq__`, so equal trials have equal hashes.
+        return hash((self._trial_id, self.number))
 
     def __repr__(self):
         # type: () -> str
@@ -152,19 +209,11 @@ class FrozenTrial(object):
     def _validate(self):
         # type: () -> None
 
-        if self.datetime_start is None:
-            raise ValueError('`datetime_start` is supposed to be set.')
-
-        if self.state.is_finished():
-            if self.datetime_complete is None:
-                raise ValueError('`datetime_complete` is supposed to be set for a finished trial.')
-        else:
-            if self.datetime_complete is not None:
-                raise ValueError(
-                    '`datetime_complete` is supposed to not be set for a finished trial.')
-
-        if self.state == TrialState.COMPLETE and self.value is None:
-            raise ValueError('`value` is supposed to be set for a complete trial.')
+        state_error = _TRIAL_STATE_ERRORS[(
+            self.state, self.datetime_start is not None, self.datetime_complete is not None,
+            self.value is not None)]
+        if state_error is not None:
+            raise ValueError(state_error)
 
         if set(self.params.keys()) != set(self.distributions.keys()):
             raise ValueError('Inconsistent parameters {} and distributions {}.'.format(
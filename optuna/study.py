@@ -730,6 +730,10 @@ def delete_study(
     """
 
     storage = storages.get_storage(storage)
+    if isinstance(storage, storages.RDBStorage):
+        storage.delete_study_by_name(study_name)
+        return
+
     study_id = storage.get_study_id_from_name(study_name)
     storage.delete_study(study_id)
 
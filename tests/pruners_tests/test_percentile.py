@@ -1,5 +1,9 @@
 import math
+from mock import patch
+import numpy as np
+import pickle
 import pytest
+import threading
 
 import optuna
 from optuna.pruners import percentile
@@ -74,6 +78,8 @@ def test_percentile_pruner_with_one_trial():
         study=study, trial=study._storage.get_trial(trial._trial_id))
 
 
+# Deprecated NumPy aliases such as `np.float` must not be used in the pruning path.
+@pytest.mark.filterwarnings('error:.*np\\.float.*:DeprecationWarning')
 @pytest.mark.parametrize('direction_value', [
     ('minimize', [1, 2, 3, 4, 5], 2.1),
     ('maximize', [1, 2, 3, 4, 5], 3.9),
@@ -173,60 +179,207 @@ def test_get_best_intermediate_result_over_steps(direction_expected):
     assert math.isnan(percentile._get_best_intermediate_result_over_steps(
         frozen_trial_nan, direction))
 
+    # Input value has enough values to be processed with NumPy.
+    trial_id_many = study._storage.create_new_trial(study.study_id)
+    trial_many = optuna.trial.Trial(study, trial_id_many)
+    for step in range(percentile._N_VALUES_NUMPY_THRESHOLD):
+        trial_many.report(float('nan') if step % 2 else 0.1 + 0.1 * (step // 2), step=step)
+    frozen_trial_many = study._storage.get_trial(trial_id_many)
+    expected_many = 0.1 if direction == StudyDirection.MINIMIZE else 0.1 + 0.1 * 15
+    assert expected_many == percentile._get_best_intermediate_result_over_steps(
+        frozen_trial_many, direction)
+
 
 def test_get_percentile_intermediate_result_over_trials():
     # type: () -> None
 
-    def setup_study(trial_num, _intermediate_values):
-        # type: (int, List[List[float]]) -> Study
-
-        _study = optuna.study.create_study(direction="minimize")
-        trial_ids = [_study._storage.create_new_trial(
-            _study.study_id) for _ in range(trial_num)]
-
-        for step, values in enumerate(_intermediate_values):
-            # Study does not have any trials.
-            with pytest.raises(ValueError):
-                _all_trials = _study._storage.get_all_trials(_study.study_id)
-                _direction = _study._storage.get_study_direction(_study.study_id)
-                percentile._get_percentile_intermediate_result_over_trials(
-                    _all_trials, _direction, step, 25)
-
-            for i in range(trial_num):
-                trial_id = trial_ids[i]
-                value = values[i]
-                _study._storage.set_trial_intermediate_value(trial_id, step, value)
-
-        # Set trial states complete because this method ignores incomplete trials.
-        for trial_id in trial_ids:
-            _study._storage.set_trial_state(trial_id, TrialState.COMPLETE)
-
-        return _study
-
-    # Input value has no NaNs but float values (step=0).
-    intermediate_values = [[0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9]]
-    study = setup_study(9, intermediate_values)
-    all_trials = study._storage.get_all_trials(study.study_id)
-    direction = study._storage.get_study_direction(study.study_id)
+    # Input value has no NaNs but float values.
+    step_values = [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9]
     assert 0.3 == percentile._get_percentile_intermediate_result_over_trials(
-        all_trials, direction, 0, 25.0)
+        step_values, StudyDirection.MINIMIZE, 25.0)
+    assert 0.7 == percentile._get_percentile_intermediate_result_over_trials(
+        step_values, StudyDirection.MAXIMIZE, 25.0)
 
-    # Input value has a float value and NaNs (step=1).
-    intermediate_values.append([
+    # Input value has a float value and NaNs.
+    step_values = [
         0.1, 0.2, 0.3, 0.4, 0.5,
-        float('nan'), float('nan'), float('nan'), float('nan')])
-    study = setup_study(9, intermediate_values)
-    all_trials = study._storage.get_all_trials(study.study_id)
-    direction = study._storage.get_study_direction(study.study_id)
+        float('nan'), float('nan'), float('nan'), float('nan')]
     assert 0.2 == percentile._get_percentile_intermediate_result_over_trials(
-        all_trials, direction, 1, 25.0)
+        step_values, StudyDirection.MINIMIZE, 25.0)
 
-    # Input value has NaNs only (step=2).
-    intermediate_values.append([
+    # Input value has NaNs only.
+    step_values = [
         float('nan'), float('nan'), float('nan'), float('nan'), float('nan'),
-        float('nan'), float('nan'), float('nan'), float('nan')])
-    study = setup_study(9, intermediate_values)
-    all_trials = study._storage.get_all_trials(study.study_id)
-    direction = study._storage.get_study_direction(study.study_id)
+        float('nan'), float('nan'), float('nan'), float('nan')]
+    assert math.isnan(percentile._get_percentile_intermediate_result_over_trials(
+        step_values, StudyDirection.MINIMIZE, 75))
+
+    # Input value is empty.
     assert math.isnan(percentile._get_percentile_intermediate_result_over_trials(
-        all_trials, direction, 2, 75))
+        [], StudyDirection.MINIMIZE, 25.0))
+
+
+@pytest.mark.parametrize('q', [0.0, 25.0, 50.0, 100.0])
+@pytest.mark.parametrize('direction', [StudyDirection.MINIMIZE, StudyDirection.MAXIMIZE])
+@pytest.mark.parametrize('step_values', [
+    [0.4, 0.1, 0.3, 0.2],
+    [0.4, float('nan'), 0.1, 0.3, float('nan'), 0.2],
+])
+def test_get_percentile_intermediate_result_over_trials_matches_nanpercentile(
+        q, direction, step_values):
+    # type: (float, StudyDirection, List[float]) -> None
+
+    expected_q = 100 - q if direction == StudyDirection.MAXIMIZE else q
+    expected = np.nanpercentile(np.array(step_values), expected_q)
+    assert expected == percentile._get_percentile_intermediate_result_over_trials(
+        step_values, direction, q)
+
+
+def test_percentile_pruner_ignores_incomplete_trials():
+    # type: () -> None
+
+    pruner = optuna.pruners.PercentilePruner(25.0, 0, 0)
+    study = optuna.study.create_study()
+
+    # Only the completed trial contributes to the percentile at step 1.
+    for v, state in [(1, TrialState.COMPLETE), (0, TrialState.PRUNED), (0, TrialState.RUNNING)]:
+        trial = optuna.trial.Trial(study, study._storage.create_new_trial(study.study_id))
+        trial.report(v, 1)
+        if state != TrialState.RUNNING:
+            study._storage.set_trial_state(trial._trial_id, state)
+
+    trial = optuna.trial.Trial(study, study._storage.create_new_trial(study.study_id))
+    trial.report(0.5, 1)
+    assert not pruner.prune(study=study, trial=study._storage.get_trial(trial._trial_id))
+
+    trial = optuna.trial.Trial(study, study._storage.create_new_trial(study.study_id))
+    trial.report(2, 1)
+    assert pruner.prune(study=study, trial=study._storage.get_trial(trial._trial_id))
+
+
+def test_percentile_pruner_percentile_cache():
+    # type: () -> None
+
+    pruner = optuna.pruners.PercentilePruner(50.0, 0, 0)
+    study = optuna.study.create_study()
+
+    def add_completed_trial(value):
+        # type: (float) -> None
+
+        trial = optuna.trial.Trial(study, study._storage.create_new_trial(study.study_id))
+        trial.report(value, 1)
+        study._storage.set_trial_state(trial._trial_id, TrialState.COMPLETE)
+
+    add_completed_trial(1)
+    add_completed_trial(3)
+
+    trial = optuna.trial.Trial(study, study._storage.create_new_trial(study.study_id))
+    trial.report(2.5, 1)
+    frozen_trial = study._storage.get_trial(trial._trial_id)
+    assert pruner.prune(study=study, trial=frozen_trial)
+    assert pruner._percentile_cache[(study.study_id, 1)][1:] == (2, 2.0)
+
+    # The cached percentile is reused without fetching the trials while the number of completed
+    # trials is unchanged.
+    with patch.object(study._storage, 'get_all_trials') as get_all_trials:
+        assert pruner.prune(study=study, trial=frozen_trial)
+    get_all_trials.assert_not_called()
+
+    # The cached percentile is recomputed once another trial completes.
+    add_completed_trial(5)
+    assert not pruner.prune(study=study, trial=frozen_trial)
+    assert pruner._percentile_cache[(study.study_id, 1)][1:] == (3, 3.0)
+
+
+def test_percentile_pruner_percentile_cache_across_studies():
+    # type: () -> None
+
+    pruner = optuna.pruners.PercentilePruner(50.0, 0, 0)
+
+    def run_study(completed_values, value):
+        # type: (List[float], float) -> bool
+
+        # Every in-memory study has the same ID, so the cached percentile of a previous study
+        # must not be reused for the next one.
+        study = optuna.study.create_study()
+        for completed_value in completed_values:
+            trial = optuna.trial.Trial(study, study._storage.create_new_trial(study.study_id))
+            trial.report(completed_value, 1)
+            study._storage.set_trial_state(trial._trial_id, TrialState.COMPLETE)
+
+        trial = optuna.trial.Trial(study, study._storage.create_new_trial(study.study_id))
+        trial.report(value, 1)
+        return pruner.prune(study=study, trial=study._storage.get_trial(trial._trial_id))
+
+    assert run_study([1, 3], 150)
+    assert not run_study([100, 300], 150)
+
+
+def test_percentile_pruner_pickle():
+    # type: () -> None
+
+    pruner = optuna.pruners.PercentilePruner(50.0, 0, 0)
+    study = optuna.study.create_study()
+
+    trial = optuna.trial.Trial(study, study._storage.create_new_trial(study.study_id))
+    trial.report(1, 1)
+    study._storage.set_trial_state(trial._trial_id, TrialState.COMPLETE)
+
+    trial = optuna.trial.Trial(study, study._storage.create_new_trial(study.study_id))
+    trial.report(2, 1)
+    assert pruner.prune(study=study, trial=study._storage.get_trial(trial._trial_id))
+    assert len(pruner._percentile_cache) == 1
+
+    restored_pruner = pickle.loads(pickle.dumps(pruner))
+    assert restored_pruner.percentile == pruner.percentile
+    assert len(restored_pruner._percentile_cache) == 0
+    assert restored_pruner.prune(study=study, trial=study._storage.get_trial(trial._trial_id))
+
+
+def test_percentile_pruner_concurrent_prune():
+    # type: () -> None
+
+    study = optuna.study.create_study()
+    n_steps = 8
+    for value in range(5):
+        trial = optuna.trial.Trial(study, study._storage.create_new_trial(study.study_id))
+        for step in range(1, n_steps + 1):
+            trial.report(value * step, step)
+        study._storage.set_trial_state(trial._trial_id, TrialState.COMPLETE)
+
+    frozen_trials = []
+    for step in range(1, n_steps + 1):
+        for value in [0, 2 * step, 4 * step]:
+            trial = optuna.trial.Trial(study, study._storage.create_new_trial(study.study_id))
+            trial.report(value, step)
+            frozen_trials.append(study._storage.get_trial(trial._trial_id))
+
+    expected = [
+        optuna.pruners.PercentilePruner(50.0, 0, 0).prune(study=study, trial=t)
+        for t in frozen_trials
+    ]
+
+    # The cache is smaller than the number of steps so that threads also evict entries
+    # concurrently.
+    with patch.object(percentile, '_PERCENTILE_CACHE_SIZE', n_steps // 2):
+        pruner = optuna.pruners.PercentilePruner(50.0, 0, 0)
+        start = threading.Event()
+        results = []  # type: List[List[bool]]
+
+        def prune_all():
+            # type: () -> None
+
+            start.wait()
+            results.append([
+                pruner.prune(study=study, trial=t) for _ in range(10) for t in frozen_trials])
+
+        threads = [threading.Thread(target=prune_all) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        start.set()
+        for thread in threads:
+            thread.join()
+
+    assert len(results) == len(threads)
+    assert all(result == expected * 10 for result in results)
+    assert len(pruner._percentile_cache) <= n_steps // 2
@@ -155,6 +155,24 @@ def test_delete_study(storage_init_func):
     assert len(trials) == 0
 
 
+def test_delete_study_by_name():
+    # type: () -> None
+
+    storage = RDBStorage('sqlite:///:memory:')
+    study_id1 = storage.create_new_study()
+    study_id2 = storage.create_new_study()
+    storage.create_new_trial(study_id2)
+
+    storage.delete_study_by_name(storage.get_study_name_from_id(study_id2))
+
+    studies = {s.study_id: s for s in storage.get_all_study_summaries()}
+    assert study_id1 in studies
+    assert study_id2 not in studies
+
+    with pytest.raises(ValueError):
+        storage.delete_study_by_name('invalid-study-name')
+
+
 def test_delete_study_after_create_multiple_studies():
     # type: () -> None
 
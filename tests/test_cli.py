@@ -56,6 +56,19 @@ def test_create_study_command_with_study_name():
         assert storage.get_study_name_from_id(study_id) == study_name
 
 
+def test_create_study_command_with_log_file():
+    # type: () -> None
+
+    with StorageSupplier('new') as storage, tempfile.NamedTemporaryFile() as tf:
+        assert isinstance(storage, RDBStorage)
+        storage_url = str(storage.engine.url)
+
+        command = ['optuna', '--log-file', tf.name, 'create-study', '--storage', storage_url]
+        study_name = str(subprocess.check_output(command).decode().strip())
+        study_id = storage.get_study_id_from_name(study_name)
+        assert storage.get_study_name_from_id(study_id) == study_name
+
+
 def test_create_study_command_without_storage_url():
     # type: () -> None
 
@@ -177,6 +190,11 @@ def test_studies_command():
         assert elms[0] == study_2.study_name
         assert elms[2] == '10'
 
+        # Check datetime_start for the second study.
+        summaries = {s.study_name: s for s in storage.get_all_study_summaries()}
+        datetime_start = summaries[study_2.study_name].datetime_start
+        assert elms[3] == datetime_start.strftime('%Y-%m-%d %H:%M:%S')
+
 
 def test_create_study_command_with_skip_if_exists():
     # type: () -> None
@@ -280,6 +298,31 @@ def test_study_optimize_command():
         assert storage.get_study_name_from_id(study.study_id).startswith(DEFAULT_STUDY_NAME_PREFIX)
 
 
+def test_study_optimize_command_without_py_suffix():
+    # type: () -> None
+
+    with StorageSupplier('new') as storage, tempfile.NamedTemporaryFile('w') as tf_objective:
+        assert isinstance(storage, RDBStorage)
+        storage_url = str(storage.engine.url)
+
+        tf_objective.write('def objective_func(trial):\n'
+                           '    x = trial.suggest_uniform("x", -10, 10)\n'
+                           '    return (x + 5) ** 2\n')
+        tf_objective.flush()
+        assert not tf_objective.name.endswith('.py')
+
+        study_name = storage.get_study_name_from_id(storage.create_new_study())
+        command = [
+            'optuna', 'study', 'optimize', '--study', study_name, '--n-trials', '10',
+            tf_objective.name, 'objective_func', '--storage', storage_url
+        ]
+        subprocess.check_call(command)
+
+        study = optuna.load_study(storage=storage_url, study_name=study_name)
+        assert len(study.trials) == 10
+        assert 'x' in study.best_params
+
+
 def test_study_optimize_command_inconsistent_args():
     # type: () -> None
 
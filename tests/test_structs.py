@@ -1,5 +1,5 @@
-import copy
 import datetime
+import pickle
 import pytest
 
 import optuna
@@ -11,128 +11,110 @@ from optuna.structs import TrialState
 if optuna.type_checking.TYPE_CHECKING:
     from typing import Any  # NOQA
     from typing import Dict  # NOQA
-    from typing import List  # NOQA
-    from typing import Tuple  # NOQA
-
-    from optuna.distributions import BaseDistribution  # NOQA
-
-
-def test_frozen_trial_validate():
-    # type: () -> None
-
-    # Valid.
-    valid_trial = FrozenTrial(number=0,
-                              trial_id=0,
-                              state=TrialState.COMPLETE,
-                              value=0.2,
-                              datetime_start=datetime.datetime.now(),
-                              datetime_complete=datetime.datetime.now(),
-                              params={'x': 10},
-                              distributions={'x': UniformDistribution(5, 12)},
-                              user_attrs={},
-                              system_attrs={},
-                              intermediate_values={})
+
+
+DATETIME_START = datetime.datetime(2020, 1, 1)
+DATETIME_COMPLETE = datetime.datetime(2020, 1, 2)
+
+UNIFORM_0_1 = UniformDistribution(0, 1)
+UNIFORM_5_12 = UniformDistribution(5, 12)
+LOG_UNIFORM_0_1 = LogUniformDistribution(0, 1)
+
+VALID_TRIAL_KWARGS = dict(
+    number=0,
+    trial_id=0,
+    state=TrialState.COMPLETE,
+    value=0.2,
+    datetime_start=DATETIME_START,
+    datetime_complete=DATETIME_COMPLETE,
+    params={'x': 10},
+    distributions={'x': UNIFORM_5_12},
+    user_attrs={},
+    system_attrs={},
+    intermediate_values={})  # type: Dict[str, Any]
+
+
+# The trial is shared by the tests in this module, which must not modify it.
+@pytest.fixture(scope='module')
+def valid_trial():
+    # type: () -> FrozenTrial
+
+    return FrozenTrial(**VALID_TRIAL_KWARGS)
+
+
+def test_frozen_trial_validate(valid_trial):
+    # type: (FrozenTrial) -> None
+
     valid_trial._validate()
 
-    # Invalid: `datetime_start` is not set.
-    invalid_trial = copy.copy(valid_trial)
-    invalid_trial.datetime_start = None
-    with pytest.raises(ValueError):
-        invalid_trial._validate()
 
-    # Invalid: `state` is `RUNNING` and `datetime_complete` is set.
-    invalid_trial = copy.copy(valid_trial)
-    invalid_trial.state = TrialState.RUNNING
+@pytest.mark.parametrize('overrides', [
+    pytest.param({'datetime_start': None}, id='no_datetime_start'),
+    pytest.param({'state': TrialState.RUNNING}, id='running_with_datetime_complete'),
+    pytest.param({'state': TrialState.COMPLETE, 'datetime_complete': None},
+                 id='complete_without_datetime_complete'),
+    pytest.param({'state': TrialState.PRUNED, 'datetime_complete': None},
+                 id='pruned_without_datetime_complete'),
+    pytest.param({'state': TrialState.FAIL, 'datetime_complete': None},
+                 id='fail_without_datetime_complete'),
+    pytest.param({'value': None}, id='complete_without_value'),
+    pytest.param({'params': {'x': 0.1, 'y': 0.5}, 'distributions': {'x': UNIFORM_0_1}},
+                 id='extra_param'),
+    pytest.param({'params': {'x': 0.1}, 'distributions': {'x': UNIFORM_0_1, 'y': LOG_UNIFORM_0_1}},
+                 id='extra_distribution'),
+    pytest.param({'params': {'x': -0.5}, 'distributions': {'x': UNIFORM_0_1}},
+                 id='param_out_of_distribution'),
+])
+def test_frozen_trial_validate_invalid(overrides):
+    # type: (Dict[str, Any]) -> None
+
+    invalid_trial = FrozenTrial(**dict(VALID_TRIAL_KWARGS, **overrides))
     with pytest.raises(ValueError):
         invalid_trial._validate()
 
-    # Invalid: `state` is not `RUNNING` and `datetime_complete` is not set.
-    for state in [TrialState.COMPLETE, TrialState.PRUNED, TrialState.FAIL]:
-        invalid_trial = copy.copy(valid_trial)
-        invalid_trial.state = state
-        invalid_trial.datetime_complete = None
-        with pytest.raises(ValueError):
-            invalid_trial._validate()
-
-    # Invalid: `state` is `COMPLETE` and `value` is not set.
-    invalid_trial = copy.copy(valid_trial)
-    invalid_trial.value = None
-    with pytest.raises(ValueError):
-        invalid_trial._validate()
 
-    # Invalid: Inconsistent `params` and `distributions`
-    inconsistent_pairs = [
-        # `params` has an extra element.
-        ({
-            'x': 0.1,
-            'y': 0.5
-        }, {
-            'x': UniformDistribution(0, 1)
-        }),
-
-        # `distributions` has an extra element.
-        ({
-            'x': 0.1
-        }, {
-            'x': UniformDistribution(0, 1),
-            'y': LogUniformDistribution(0, 1)
-        }),
-
-        # The value of `x` isn't contained in the distribution.
-        ({
-            'x': -0.5
-        }, {
-            'x': UniformDistribution(0, 1)
-        })
-    ]  # type: List[Tuple[Dict[str, Any], Dict[str, BaseDistribution]]]
-
-    for params, distributions in inconsistent_pairs:
-        invalid_trial = copy.copy(valid_trial)
-        invalid_trial.params = params
-        invalid_trial.distributions = distributions
-        with pytest.raises(ValueError):
-            invalid_trial._validate()
-
-
-def test_frozen_trial_eq_ne():
-    # type: () -> None
-
-    trial = FrozenTrial(number=0,
-                        trial_id=0,
-                        state=TrialState.COMPLETE,
-                        value=0.2,
-                        datetime_start=datetime.datetime.now(),
-                        datetime_complete=datetime.datetime.now(),
-                        params={'x': 10},
-                        distributions={'x': UniformDistribution(5, 12)},
-                        user_attrs={},
-                        system_attrs={},
-                        intermediate_values={})
-
-    trial_other = copy.copy(trial)
-    assert trial == trial_other
-
-    trial_other.value = 0.3
-    assert trial != trial_other
+def test_frozen_trial_eq_ne(valid_trial):
+    # type: (FrozenTrial) -> None
+
+    trial_other = FrozenTrial(**VALID_TRIAL_KWARGS)
+    assert valid_trial == trial_other
+
+    trial_other = FrozenTrial(**dict(VALID_TRIAL_KWARGS, value=0.3))
+    assert valid_trial != trial_other
+
+    trial_other = FrozenTrial(**dict(VALID_TRIAL_KWARGS, trial_id=1))
+    assert valid_trial != trial_other
+
+
+def test_frozen_trial_hash(valid_trial):
+    # type: (FrozenTrial) -> None
+
+    trial_other = FrozenTrial(**VALID_TRIAL_KWARGS)
+    assert hash(valid_trial) == hash(trial_other)
+    assert len({valid_trial, trial_other}) == 1
+
+
+@pytest.mark.parametrize('protocol', range(pickle.HIGHEST_PROTOCOL + 1))
+def test_frozen_trial_pickle(valid_trial, protocol):
+    # type: (FrozenTrial, int) -> None
+
+    restored_trial = pickle.loads(pickle.dumps(valid_trial, protocol))
+    assert restored_trial == valid_trial
+    assert restored_trial.distributions == valid_trial.distributions
 
 
 # TODO(hvy): Remove version check after Python 2.7 is retired.
 @pytest.mark.skipif(
     'sys.version_info < (3, 5)',
     reason='Cannot eval/reconstruct namedtuple distributions in Python 2.7.')
-def test_frozen_trial_repr():
-    # type: () -> None
-
-    trial = FrozenTrial(number=0,
-                        trial_id=0,
-                        state=TrialState.COMPLETE,
-                        value=0.2,
-                        datetime_start=datetime.datetime.now(),
-                        datetime_complete=datetime.datetime.now(),
-                        params={'x': 10},
-                        distributions={'x': UniformDistribution(5, 12)},
-                        user_attrs={},
-                        system_attrs={},
-                        intermediate_values={})
-
-    assert trial == eval(repr(trial))
+def test_frozen_trial_repr(valid_trial):
+    # type: (FrozenTrial) -> None
+
+    # Evaluate the representation with only the names that it is supposed to refer to.
+    namespace = {
+        'datetime': datetime,
+        'FrozenTrial': FrozenTrial,
+        'TrialState': TrialState,
+        'UniformDistribution': UniformDistribution,
+    }
+    assert valid_trial == eval(repr(valid_trial), namespace)